@@ -0,0 +1,296 @@
+// ルール一式はページ内の <script type="application/json"> ブロックから読む
+const rules = JSON.parse(document.getElementById('rules-data').textContent);
+const statusData = rules.status;
+const scholarshipData = rules.scholarship;
+const scholarshipStatusData = rules.scholarship_status;
+const commonRequirements = rules.common;
+const statusOptionalData = rules.status_optional;
+const scenarioOptionalData = rules.scenario_optional;
+const ADVANCEMENT_NOTICE_HTML = rules.advancement_notice.replace(/\n/g, '<br />');
+const ADVANCEMENT_NOTICE_LABELS = rules.advancement_notice_labels;
+const nonGovScholarships = [
+  "日本政府以外の給付型の奨学金受給学生",
+  "日本政府以外の貸与型の奨学金受給学生",
+];
+
+const statusSelect = document.getElementById('status');
+const scenarioList = document.getElementById('scenario-list');
+const scholarshipSelect = document.getElementById('scholarship');
+const scholarshipStatusGroup = document.getElementById('scholarship-status-group');
+const scholarshipStatusSelect = document.getElementById('scholarship-status');
+const showButton = document.getElementById('show');
+const results = document.getElementById('results');
+const optionsContainer = document.getElementById('options');
+
+// 3つの <select> の選択肢はサーバー側でレンダリング済み。JS はイベントの
+// 配線とシナリオ・結果表示だけを受け持つ。
+let selectedScenarios = new Set();
+// チェックボックスごとの選択項目（ラベルと必要書類）。dataset に文字列で
+// 持たせるとシリアライズ往復が要るので、Map で要素から直接引く。
+const optionRegistry = new Map();
+
+// 連続クリック時に再描画が積み重ならないよう、1フレームにまとめる。
+// オプション一覧の再構築はチェック状態を消すので、必要なときだけ行う。
+let renderScheduled = false;
+let optionsDirty = false;
+function scheduleRender(withOptions) {
+  if (withOptions) optionsDirty = true;
+  if (renderScheduled) return;
+  renderScheduled = true;
+  requestAnimationFrame(() => {
+    renderScheduled = false;
+    if (optionsDirty) {
+      optionsDirty = false;
+      renderOptions();
+    }
+    showRequirements();
+  });
+}
+
+function buildScenarioLabelCandidates(label) {
+  const candidates = [label];
+  if (label.startsWith('この期間内に、')) {
+    candidates.push(label.replace('この期間内に、', '前学期、'));
+  }
+  if (label.startsWith('前学期、')) {
+    candidates.push(label.replace('前学期、', 'この期間内に、'));
+  }
+  return candidates;
+}
+
+function renderOptions() {
+  optionsContainer.innerHTML = '';
+  optionRegistry.clear();
+  const status = statusSelect.value;
+  if (!status) return;
+
+  // ラベルの重複を見ながら1パスで集める（中間配列と Map を作らない）
+  const seenLabels = new Set();
+  const dedupedItems = [];
+  const pushItems = (items) => {
+    for (const item of items) {
+      if (!seenLabels.has(item.label)) {
+        seenLabels.add(item.label);
+        dedupedItems.push(item);
+      }
+    }
+  };
+
+  pushItems(statusOptionalData[status] || []);
+
+  const scenarioOptions = scenarioOptionalData[status] || {};
+  selectedScenarios.forEach((scenarioLabel) => {
+    buildScenarioLabelCandidates(scenarioLabel).forEach((candidate) => {
+      if (scenarioOptions[candidate]) {
+        pushItems(scenarioOptions[candidate]);
+      }
+    });
+  });
+
+  if (!dedupedItems.length) return;
+
+  const wrapper = document.createElement('div');
+  const description = document.createElement('div');
+  description.textContent = '該当する場合はチェックを入れてください';
+  description.style.fontWeight = '600';
+  description.style.marginBottom = '0.35rem';
+  wrapper.appendChild(description);
+
+  dedupedItems.forEach((item, idx) => {
+    const label = document.createElement('label');
+    label.style.fontWeight = '500';
+    label.style.display = 'flex';
+    label.style.alignItems = 'center';
+    label.style.gap = '0.4rem';
+    label.style.marginBottom = '0.25rem';
+
+    const checkbox = document.createElement('input');
+    checkbox.type = 'checkbox';
+    checkbox.id = `option-${idx}`;
+    optionRegistry.set(checkbox, item);
+    checkbox.addEventListener('change', () => scheduleRender(false));
+
+    const text = document.createElement('span');
+    text.textContent = item.label;
+
+    label.appendChild(checkbox);
+    label.appendChild(text);
+    wrapper.appendChild(label);
+  });
+
+  optionsContainer.appendChild(wrapper);
+}
+
+function resetScenarioSelection() {
+  selectedScenarios = new Set();
+}
+
+function updateShowButtonState() {
+  showButton.disabled = !statusSelect.value || selectedScenarios.size === 0;
+}
+
+function toggleScenarioSelection(label, button, event) {
+  if (event && event.detail > 1) {
+    return;
+  }
+
+  if (selectedScenarios.has(label)) {
+    selectedScenarios.delete(label);
+    button.classList.remove('selected');
+    button.setAttribute('aria-pressed', 'false');
+  } else {
+    selectedScenarios.add(label);
+    button.classList.add('selected');
+    button.setAttribute('aria-pressed', 'true');
+  }
+
+  updateShowButtonState();
+  scheduleRender(true);
+}
+
+function renderScenarios() {
+  const status = statusSelect.value;
+  scenarioList.innerHTML = '';
+  resetScenarioSelection();
+  updateShowButtonState();
+  renderOptions();
+
+  if (!status) {
+    const placeholder = document.createElement('span');
+    placeholder.textContent = '現在の身分を先に選んでください';
+    placeholder.classList.add('muted');
+    scenarioList.appendChild(placeholder);
+    return;
+  }
+
+  const fragment = document.createDocumentFragment();
+  Object.keys(statusData[status]).forEach((label) => {
+    const button = document.createElement('button');
+    button.type = 'button';
+    button.textContent = label;
+    button.className = 'scenario-pill';
+    button.setAttribute('aria-pressed', 'false');
+    button.addEventListener('click', (event) =>
+      toggleScenarioSelection(label, button, event)
+    );
+    fragment.appendChild(button);
+  });
+  scenarioList.appendChild(fragment);
+}
+
+function escapeHtml(value) {
+  return String(value)
+    .replace(/&/g, '&amp;')
+    .replace(/</g, '&lt;')
+    .replace(/>/g, '&gt;')
+    .replace(/"/g, '&quot;');
+}
+
+function renderRequirements(requirements, noticeText) {
+  // 要素を1件ずつ追加せず、HTML 文字列を組み立てて一度で差し替える。
+  // noticeText はサーバー定数由来の HTML（<br /> 入り）なのでそのまま使う。
+  const noticeHtml = noticeText
+    ? `<p style="margin-bottom: 0.5rem;"><strong style="color: #c00;">${noticeText}</strong></p>`
+    : '';
+
+  if (!requirements.length) {
+    results.innerHTML = noticeHtml + '<p>必要な書類はありません。</p>';
+    return;
+  }
+
+  const items = requirements
+    .map((item) => `<li>${escapeHtml(item)}</li>`)
+    .join('');
+  results.innerHTML = `${noticeHtml}<ul>${items}</ul>`;
+}
+
+function getSelectedOptionalSelections() {
+  const checkboxes = optionsContainer.querySelectorAll(
+    'input[type="checkbox"]:checked'
+  );
+  return Array.from(checkboxes).map((checkbox) => {
+    const item = optionRegistry.get(checkbox);
+    return {
+      label: item ? item.label : '',
+      requirements: item ? item.requirements || [] : [],
+    };
+  });
+}
+
+function showRequirements() {
+  const status = statusSelect.value;
+  const scholarship = scholarshipSelect.value;
+  const scholarshipStatus = nonGovScholarships.includes(scholarship)
+    ? scholarshipStatusSelect.value
+    : '';
+  if (!status || selectedScenarios.size === 0) {
+    renderRequirements([]);
+    return;
+  }
+
+  const scenarios = statusData[status] || {};
+  const scenarioRequirements = Array.from(selectedScenarios).flatMap(
+    (label) => scenarios[label] || []
+  );
+  const optionalSelections = getSelectedOptionalSelections();
+  const optionalRequirements = optionalSelections.flatMap(
+    (selection) => selection.requirements
+  );
+  const shouldShowAdvancementNotice = optionalSelections.some(
+    (selection) => ADVANCEMENT_NOTICE_LABELS.includes(selection.label)
+  );
+  const noticeText = shouldShowAdvancementNotice ? ADVANCEMENT_NOTICE_HTML : '';
+  const requirements = [
+    ...commonRequirements,
+    ...scenarioRequirements,
+    ...optionalRequirements,
+    ...(scholarship ? (scholarshipData[scholarship] || []) : []),
+    ...(scholarshipStatus
+      ? scholarshipStatusData[scholarshipStatus] || []
+      : []),
+  ];
+  renderRequirements(requirements, noticeText);
+}
+
+statusSelect.addEventListener('change', () => {
+  renderScenarios();
+  scheduleRender(false);
+});
+
+// プレースホルダーはサーバー側で2つレンダリング済み。change のたびに
+// textContent を書き換えるのではなく、状態が変わったときだけ hidden を
+// 入れ替える。
+const scholarshipStatusPlaceholders = {
+  empty: scholarshipStatusSelect.querySelector('option[data-state="empty"]'),
+  ready: scholarshipStatusSelect.querySelector('option[data-state="ready"]'),
+};
+let scholarshipStatusState = 'empty';
+
+function setScholarshipStatusPlaceholder(state) {
+  if (state === scholarshipStatusState) return;
+  scholarshipStatusState = state;
+  scholarshipStatusPlaceholders[state].hidden = false;
+  scholarshipStatusPlaceholders[state === 'empty' ? 'ready' : 'empty'].hidden = true;
+  if (!scholarshipStatusSelect.value) {
+    scholarshipStatusPlaceholders[state].selected = true;
+  }
+}
+
+scholarshipSelect.addEventListener('change', () => {
+  const isNonGov = nonGovScholarships.includes(scholarshipSelect.value);
+  if (isNonGov) {
+    scholarshipStatusGroup.classList.remove('hidden');
+    scholarshipStatusSelect.disabled = false;
+    setScholarshipStatusPlaceholder('ready');
+  } else {
+    scholarshipStatusGroup.classList.add('hidden');
+    scholarshipStatusSelect.value = '';
+    scholarshipStatusSelect.disabled = true;
+    setScholarshipStatusPlaceholder('empty');
+  }
+  scheduleRender(false);
+});
+scholarshipStatusSelect.addEventListener('change', () => scheduleRender(false));
+showButton.addEventListener('click', showRequirements);
+
+renderScenarios();
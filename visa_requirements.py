@@ -7,8 +7,12 @@ Web システムからインポートして利用します。
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 
 COMMON_REQUIREMENTS: List[str] = [
     "在留期間更新許可申請書（申請人等作成用の3枚 + 所属機関等作成用の2枚）",
@@ -26,146 +30,162 @@ ADVANCEMENT_OPTION_LABEL = "これから進学予定"
 ADVANCEMENT_NOTICE_LABELS = [ADVANCEMENT_OPTION_LABEL, "大学院進学予定"]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Scenario:
     label: str
-    requirements: List[str]
+    requirements: Tuple[str, ...]
+
+    def __post_init__(self) -> None:
+        # frozen のため object.__setattr__ で正規化する。書類名は複数の
+        # シナリオに重複して現れるので intern して1オブジェクトに共有する。
+        object.__setattr__(
+            self,
+            "requirements",
+            tuple(sys.intern(s) for s in self.requirements),
+        )
 
 
-STATUS_RULES: Dict[str, List[Scenario]] = {
+STATUS_RULES: Mapping[str, List[Scenario]] = {
     "正規生": [
         Scenario(
             label="この期間内に、現在と同じ身分で正規生として在籍していた",
-            requirements=[
+            requirements=(
                 "成績証明書（証明書自動発行機で発行）",
                 "在学証明書（証明書自動発行機で発行）",
-            ],
+            ),
         ),
         Scenario(
             label="この期間内に、現在とは異なる身分で正規生として在籍していた（学部生→修士、修士→博士等）",
-            requirements=[
+            requirements=(
                 "成績証明書（証明書自動発行機で発行）",
                 "在学証明書（証明書自動発行機で発行）",
                 "修了証明書（旧所属の支援室で発行）",
-            ],
+            ),
         ),
         Scenario(
             label="この期間内に、研究生として在籍していた",
-            requirements=[
+            requirements=(
                 "在学証明書（証明書自動発行機で発行）",
                 "外国人研究生証明書(別紙様式５)（旧所属の支援室で発行）",
-            ],
+            ),
         ),
         Scenario(
             label="この期間内に、日本語学校に在籍していた",
-            requirements=[
+            requirements=(
                 "在学証明書（証明書自動発行機で発行）",
                 "成績・出席証明書（日本語学校が発行）",
                 "卒業証明書（日本語学校が発行）",
-            ],
+            ),
         ),
         Scenario(
             label="この期間内に、他大学に在籍していた",
-            requirements=[
+            requirements=(
                 "在学証明書（証明書自動発行機で発行）",
                 "成績証明書（他大学が発行）",
                 "卒業証明書（他大学が発行）",
-            ],
+            ),
         ),
     ],
     "研究生": [
         Scenario(
             label="この期間内も研究生として在籍していた",
-            requirements=[
+            requirements=(
                 "外国人研究生証明書(別紙様式５)（所属の支援室で発行）",
-            ],
+            ),
         ),
         Scenario(
             label="この期間内に、日本語学校に在籍していた",
-            requirements=[
+            requirements=(
                 "外国人研究生証明書(別紙様式５)（所属の支援室で発行）",
                 "成績・出席証明書（日本語学校が発行）",
                 "卒業証明書（日本語学校が発行）",
-            ],
+            ),
         ),
         Scenario(
             label="この期間内に、他大学に在籍していた",
-            requirements=[
+            requirements=(
                 "外国人研究生証明書(別紙様式５)（所属の支援室で発行）",
                 "成績証明書（他大学が発行）",
                 "卒業証明書（他大学が発行）",
-            ],
+            ),
         ),
         Scenario(
             label="この期間内に、3+1特別聴講生(C)として在籍していた（9月で在留期限が切れる場合）",
-            requirements=[
+            requirements=(
                 "外国人研究生証明書(別紙様式５)（所属の支援室で発行）",
                 "成績証明書（3+1プログラムの成績）",
-            ],
+            ),
         ),
         Scenario(
             label="この期間内に、正規生として在籍していた",
-            requirements=[
+            requirements=(
                 "外国人研究生証明書(別紙様式５)（所属の支援室で発行）",
                 "成績証明書（旧所属の支援室で発行）",
                 "修了証明書（旧所属の支援室で発行）",
-            ],
+            ),
         ),
     ],
     "特別聴講学生": [
         Scenario(
             label="この期間内に、他大学に在籍していた",
-            requirements=[
+            requirements=(
                 "在学証明書（所属の支援室で発行）",
                 "成績証明書（他大学が発行）",
                 "卒業証明書（他大学が発行）",
-            ],
+            ),
         ),
         Scenario(
             label="この期間内に、本学の特別聴講生として在籍していた",
-            requirements=[
+            requirements=(
                 "在学証明書（所属の支援室で発行）",
                 "成績証明書（所属の支援室で発行）",
-            ],
+            ),
         ),
     ],
 }
 
 
-STATUS_OPTIONAL_RULES: Dict[str, List[Scenario]] = {
+# 状況ラベルから Scenario を O(1) で引けるよう、起動時に索引を作っておく
+STATUS_SCENARIO_INDEX: Mapping[str, Dict[str, Scenario]] = {
+    status: {sc.label: sc for sc in scenarios}
+    for status, scenarios in STATUS_RULES.items()
+}
+
+
+STATUS_OPTIONAL_RULES: Mapping[str, List[Scenario]] = {
     "正規生": [
-        Scenario(label="標準修業年限を超えて研究する", requirements=[
-            "理由書(延長期間・理由を指導教員に記入してもらい、提出)(用紙は所属の支援室・留学交流グループにあります)"
-            ]),
-        Scenario(label=ADVANCEMENT_OPTION_LABEL, requirements=[
-            "合格通知書(コピー)"
-            ]),
+        Scenario(label="標準修業年限を超えて研究する", requirements=(
+            "理由書(延長期間・理由を指導教員に記入してもらい、提出)(用紙は所属の支援室・留学交流グループにあります)",
+            )),
+        Scenario(label=ADVANCEMENT_OPTION_LABEL, requirements=(
+            "合格通知書(コピー)",
+            )),
     ],
     "研究生": [
-        Scenario(label="1年以上研究生を続けている", requirements=[
-            "「外国人研究生について」の書類(所属の支援室に依頼)"
-            ]),
-        Scenario(label="大学院進学予定", requirements=[
-            "合格通知書(コピー)"
-            ]),
-        Scenario(label="研究継続予定", requirements=[
-            "研究継続許可書(コピー)"
-            ]),
+        Scenario(label="1年以上研究生を続けている", requirements=(
+            "「外国人研究生について」の書類(所属の支援室に依頼)",
+            )),
+        Scenario(label="大学院進学予定", requirements=(
+            "合格通知書(コピー)",
+            )),
+        Scenario(label="研究継続予定", requirements=(
+            "研究継続許可書(コピー)",
+            )),
     ],
 }
 
 
-SCENARIO_OPTIONAL_RULES: Dict[str, Dict[str, List[Scenario]]] = {
+SCENARIO_OPTIONAL_RULES: Mapping[str, Dict[str, List[Scenario]]] = {
     "研究生": {
         "この期間内に、3+1特別聴講生(C)として在籍していた（9月で在留期限が切れる場合）": [
             Scenario(
                 label="これから研究生になる方",
-                requirements=["外国人研究生 許可書(コピー)"],
+                requirements=("外国人研究生 許可書(コピー)",),
             ),
-            Scenario(label="修士に進学する方", requirements=["合格通知書(コピー)"]),
+            Scenario(label="修士に進学する方", requirements=("合格通知書(コピー)",)),
             Scenario(
                 label="大学院で研究生を継続予定",
-                requirements=["外国人研究生証明書(大学院)"],
+                requirements=("外国人研究生証明書(大学院)",),
             ),
         ]
     },
@@ -173,20 +193,20 @@ SCENARIO_OPTIONAL_RULES: Dict[str, Dict[str, List[Scenario]]] = {
         "この期間内に、他大学に在籍していた": [
             Scenario(
                 label="日本の大学に１年以上在籍",
-                requirements=["理由書(本学と本人からの両方を１枚に)"],
+                requirements=("理由書(本学と本人からの両方を１枚に)",),
             ),
         ],
         "この期間内に、本学の特別聴講生として在籍していた": [
             Scenario(
                 label="本学に１年以上在籍",
-                requirements=["理由書(本学と本人からの両方を１枚に)"],
+                requirements=("理由書(本学と本人からの両方を１枚に)",),
             ),
         ]
     },
 }
 
 
-SCHOLARSHIP_RULES: Dict[str, List[str]] = {
+SCHOLARSHIP_RULES: Mapping[str, List[str]] = {
     "国費留学生": ["日本政府奨学金受給証明書（留学交流グループで発行）"],
     "日韓共同理工系学部留学生": ["日韓共同理工系学部留学生奨学金証明書（留学交流グループで発行）"],
     "日本政府以外の給付型の奨学金受給学生": ["奨学金証明書（コピー）"],
@@ -194,7 +214,7 @@ SCHOLARSHIP_RULES: Dict[str, List[str]] = {
 }
 
 
-SCHOLARSHIP_STATUS_RULES: Dict[str, List[str]] = {
+SCHOLARSHIP_STATUS_RULES: Mapping[str, List[str]] = {
     "前回申請以降に新たに奨学金を受給": [
         "奨学金決定通知書（財団等が発行。作成できない場合は大学が発行した証明書）",
         "通帳の写し（奨学金の入金が確認できるページ）",
@@ -205,41 +225,120 @@ SCHOLARSHIP_STATUS_RULES: Dict[str, List[str]] = {
 }
 
 
+def _intern_requirement_strings() -> None:
+    """書類名の文字列を intern して、同一文言を1オブジェクトに共有する。
+
+    同じ書類名が複数のシナリオに重複して現れるため、intern しておくと
+    保持する文字列オブジェクトが減り、比較・ハッシュも速くなります。
+    """
+
+    # Scenario の requirements は __post_init__ で intern 済み
+    COMMON_REQUIREMENTS[:] = [sys.intern(s) for s in COMMON_REQUIREMENTS]
+    for rules in (SCHOLARSHIP_RULES, SCHOLARSHIP_STATUS_RULES):
+        for key, values in rules.items():
+            rules[key] = [sys.intern(s) for s in values]
+
+
+_intern_requirement_strings()
+
+# ルール表は以後読み取り専用。MappingProxyType のビューに差し替えて、
+# ハンドラやインポート先からの偶発的な書き換えを防ぐ。
+STATUS_RULES = MappingProxyType(dict(STATUS_RULES))
+STATUS_SCENARIO_INDEX = MappingProxyType(dict(STATUS_SCENARIO_INDEX))
+STATUS_OPTIONAL_RULES = MappingProxyType(dict(STATUS_OPTIONAL_RULES))
+SCENARIO_OPTIONAL_RULES = MappingProxyType(dict(SCENARIO_OPTIONAL_RULES))
+SCHOLARSHIP_RULES = MappingProxyType(dict(SCHOLARSHIP_RULES))
+SCHOLARSHIP_STATUS_RULES = MappingProxyType(dict(SCHOLARSHIP_STATUS_RULES))
+
+# シナリオ表の SoA（列ごと）ビュー。ラベル列と書類列を平行なタプルで
+# 持つことで、JSON 化などの走査が dataclass の属性参照を介さずに済む。
+STATUS_LABELS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    status: tuple(sc.label for sc in scenarios)
+    for status, scenarios in STATUS_RULES.items()
+})
+STATUS_REQS: Mapping[str, Tuple[Tuple[str, ...], ...]] = MappingProxyType({
+    status: tuple(sc.requirements for sc in scenarios)
+    for status, scenarios in STATUS_RULES.items()
+})
+
+
+def _build_precomputed_table() -> Dict[
+    Tuple[str, str, Optional[str], Optional[str]], Tuple[str, ...]
+]:
+    """既知の条件の全組み合わせについて必要書類を展開した表を作る。
+
+    入力の組み合わせは高々数百件なので、起動時に全件を展開しておき、
+    get_requirements は辞書引き一回で結果を返せるようにします。
+    """
+
+    table: Dict[Tuple[str, str, Optional[str], Optional[str]], Tuple[str, ...]] = {}
+    for status, scenarios in STATUS_RULES.items():
+        for scenario in scenarios:
+            for scholarship in (None, *SCHOLARSHIP_RULES):
+                for scholarship_status in (None, *SCHOLARSHIP_STATUS_RULES):
+                    table[(status, scenario.label, scholarship, scholarship_status)] = tuple(
+                        [
+                            *COMMON_REQUIREMENTS,
+                            *scenario.requirements,
+                            *SCHOLARSHIP_RULES.get(scholarship, []),
+                            *SCHOLARSHIP_STATUS_RULES.get(scholarship_status, []),
+                        ]
+                    )
+    return table
+
+
+_PRECOMPUTED: Dict[
+    Tuple[str, str, Optional[str], Optional[str]], Tuple[str, ...]
+] = _build_precomputed_table()
+
+
+@lru_cache(maxsize=256)
 def get_requirements(
     status: str,
     scenario_label: str,
     scholarship: Optional[str],
     scholarship_status: Optional[str] = None,
-) -> List[str]:
-    """指定された条件に一致する必要書類を返します。"""
+) -> Tuple[str, ...]:
+    """指定された条件に一致する必要書類を返します。
+
+    引数はすべて文字列（または None）の組み合わせで件数も限られるため、
+    lru_cache で同じ組み合わせの再計算を省きます。返り値はタプルです。
+    """
+
+    precomputed = _PRECOMPUTED.get(
+        (status, scenario_label, scholarship or None, scholarship_status or None)
+    )
+    if precomputed is not None:
+        return precomputed
 
+    # 未登録の奨学金区分・状況はプレースホルダー文言を返すため、
+    # 展開表に載らない組み合わせだけ従来どおり組み立てる。
     if status not in STATUS_RULES:
         raise ValueError(f"未対応の身分です: {status}")
 
-    scenarios = STATUS_RULES[status]
-    scenario: Optional[Scenario] = next(
-        (sc for sc in scenarios if sc.label == scenario_label), None
-    )
+    scenario: Optional[Scenario] = STATUS_SCENARIO_INDEX[status].get(scenario_label)
     if scenario is None:
-        valid = ", ".join(sc.label for sc in scenarios)
+        valid = ", ".join(STATUS_SCENARIO_INDEX[status].keys())
         raise ValueError(f"シナリオが一致しません: {scenario_label}。候補: {valid}")
 
-    requirements: List[str] = [*COMMON_REQUIREMENTS, *scenario.requirements]
-
+    scholarship_requirements: List[str] = []
     if scholarship:
         scholarship_requirements = SCHOLARSHIP_RULES.get(
             scholarship, [f"奨学金区分 '{scholarship}' は登録されていません。"]
         )
-        requirements.extend(scholarship_requirements)
 
+    scholarship_status_requirements: List[str] = []
     if scholarship_status:
-        requirements.extend(
-            SCHOLARSHIP_STATUS_RULES.get(
-                scholarship_status,
-                [
-                    f"奨学金状況 '{scholarship_status}' は登録されていません。",
-                ],
-            )
+        scholarship_status_requirements = SCHOLARSHIP_STATUS_RULES.get(
+            scholarship_status,
+            [f"奨学金状況 '{scholarship_status}' は登録されていません。"],
         )
 
-    return requirements
+    return tuple(
+        chain(
+            COMMON_REQUIREMENTS,
+            scenario.requirements,
+            scholarship_requirements,
+            scholarship_status_requirements,
+        )
+    )
@@ -2,11 +2,23 @@
 
 from __future__ import annotations
 
-import argparse
-import json
-from typing import Dict, List
+import gzip
+import hashlib
+import os
+from types import MappingProxyType
+from typing import Dict, Final, List
 
-from flask import Flask, Response, render_template_string
+from flask import Flask, Response, request
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 from visa_requirements import (
     ADVANCEMENT_NOTICE,
@@ -15,19 +27,55 @@ from visa_requirements import (
     SCHOLARSHIP_RULES,
     SCHOLARSHIP_STATUS_RULES,
     SCENARIO_OPTIONAL_RULES,
+    STATUS_LABELS,
     STATUS_OPTIONAL_RULES,
-    STATUS_RULES,
+    STATUS_REQS,
 )
 
 app = Flask(__name__)
+# Flask 標準の JSON プロバイダにも非 ASCII をそのまま・空白なしで
+# 出力させる（jsonify やエラー応答もこの設定を通る）
+app.json.ensure_ascii = False
+app.json.compact = True
+# 既定ではキーがコードポイント順にソートされてしまい、ルール定義の
+# 記述順（クライアントの表示順）が崩れるので無効にする
+app.json.sort_keys = False
+# 静的アセットはバージョンクエリ付きで参照するので長期キャッシュさせる
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 31536000
+
+
+def _static_asset_url(filename: str) -> str:
+    """static 配下のファイルを指す、内容ハッシュ付きの URL を返す。"""
+
+    path = os.path.join(app.static_folder, filename)
+    with open(path, "rb") as fp:
+        digest = hashlib.sha1(fp.read()).hexdigest()[:12]
+    return f"/static/{filename}?v={digest}"
+
 
+def _dumps(payload: object) -> str:
+    """非 ASCII をそのまま出力する JSON 文字列化。orjson があれば使う。"""
 
-def build_status_payload() -> Dict[str, List[Dict[str, List[str]]]]:
-    """シリアライズしやすい形で身分・状況データを返す。"""
+    if orjson is not None:
+        return orjson.dumps(payload).decode("utf-8")
+    # provider の compact 設定はレスポンス生成時のみ効くので、ここでも
+    # セパレータを明示して orjson と同じ詰めた出力に揃える
+    return app.json.dumps(payload, separators=(",", ":"))
+
+
+def build_status_payload() -> Dict[str, Dict[str, List[str]]]:
+    """シリアライズしやすい形で身分・状況データを返す。
+
+    状況ラベルをキーにした辞書にしておくことで、クライアント側の参照も
+    配列走査なしの O(1) で済みます（挿入順は保持されます）。
+    """
 
     return {
-        status: [{"label": sc.label, "requirements": sc.requirements} for sc in scenarios]
-        for status, scenarios in STATUS_RULES.items()
+        status: {
+            label: list(requirements)
+            for label, requirements in zip(STATUS_LABELS[status], STATUS_REQS[status])
+        }
+        for status in STATUS_LABELS
     }
 
 
@@ -43,43 +91,98 @@ def build_optional_payload(
     }
 
 
+def build_scenario_optional_payload() -> Dict[str, Dict[str, List[Dict[str, List[str]]]]]:
+    return {
+        status: {
+            scenario: [
+                {"label": sc.label, "requirements": sc.requirements}
+                for sc in options
+            ]
+            for scenario, options in scenario_options.items()
+        }
+        for status, scenario_options in SCENARIO_OPTIONAL_RULES.items()
+    }
+
+
+# ペイロードはモジュール定数だけから決まるので、起動時に一度だけ組み立てる
+_STATUS_PAYLOAD = build_status_payload()
+_STATUS_OPT_PAYLOAD = build_optional_payload(STATUS_OPTIONAL_RULES)
+_SCENARIO_OPT_PAYLOAD = build_scenario_optional_payload()
+
+# ルール一式をひとつの JSON にまとめる。ページへの埋め込みと /api/rules の
+# 両方でこの文字列を使い回し、内容ハッシュを ETag として配信する。
+_RULES_PAYLOAD = {
+    "status": _STATUS_PAYLOAD,
+    "status_optional": _STATUS_OPT_PAYLOAD,
+    "scenario_optional": _SCENARIO_OPT_PAYLOAD,
+    # ルール表は読み取り専用ビュー（mappingproxy）なので dict に写して渡す
+    "scholarship": dict(SCHOLARSHIP_RULES),
+    "scholarship_status": dict(SCHOLARSHIP_STATUS_RULES),
+    "common": COMMON_REQUIREMENTS,
+    "advancement_notice": ADVANCEMENT_NOTICE,
+    "advancement_notice_labels": ADVANCEMENT_NOTICE_LABELS,
+}
+_RULES_JSON: Final[str] = _dumps(_RULES_PAYLOAD)
+_RULES_VERSION: Final[str] = hashlib.sha1(_RULES_JSON.encode("utf-8")).hexdigest()[:12]
+
+# シリアライズが済んだら、キャッシュ済みペイロードはハンドラ等から
+# 書き換えられないよう読み取り専用ビューに差し替える
+_STATUS_PAYLOAD = MappingProxyType(_STATUS_PAYLOAD)
+_STATUS_OPT_PAYLOAD = MappingProxyType(_STATUS_OPT_PAYLOAD)
+_SCENARIO_OPT_PAYLOAD = MappingProxyType(_SCENARIO_OPT_PAYLOAD)
+_RULES_PAYLOAD = MappingProxyType(_RULES_PAYLOAD)
+
+
+@app.route("/api/rules")
+def rules() -> Response:
+    """ルール一式を JSON で返す。内容は起動時に確定している。"""
+
+    response = Response(_RULES_JSON, mimetype="application/json")
+    # URL にバージョンクエリが付いているので immutable で長期キャッシュできる
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    response.set_etag(_RULES_VERSION)
+    # If-None-Match が一致すれば本文なしの 304 を返す
+    return response.make_conditional(request)
+
+
+def _render_index_html() -> str:
+    """ルールデータを埋め込んだ index ページを生成する。
+
+    ルールはすべてモジュール定数で変化しないため、起動時に一度だけ
+    呼び出して結果をキャッシュします。テンプレートはコンパイル済みの
+    _INDEX_TEMPLATE を使うので、Jinja の字句解析・構文解析も一度きりです。
+    """
+
+    with app.app_context():
+        return _INDEX_TEMPLATE.render(
+            rules_json=_RULES_JSON,
+            css_url=_static_asset_url("app.css"),
+            js_url=_static_asset_url("app.js"),
+            statuses=list(_STATUS_PAYLOAD),
+            scholarships=list(SCHOLARSHIP_RULES),
+            scholarship_statuses=list(SCHOLARSHIP_STATUS_RULES),
+        )
+
+
 @app.route("/")
 def index() -> Response:
-    status_payload = build_status_payload()
-    status_json = json.dumps(status_payload, ensure_ascii=False)
-    status_optional_json = json.dumps(
-        build_optional_payload(STATUS_OPTIONAL_RULES), ensure_ascii=False
-    )
-    scenario_optional_json = json.dumps(
-        {
-            status: {
-                scenario: [
-                    {"label": sc.label, "requirements": sc.requirements}
-                    for sc in options
-                ]
-                for scenario, options in scenario_options.items()
-            }
-            for status, scenario_options in SCENARIO_OPTIONAL_RULES.items()
-        },
-        ensure_ascii=False,
-    )
-    scholarship_json = json.dumps(SCHOLARSHIP_RULES, ensure_ascii=False)
-    scholarship_status_json = json.dumps(
-        SCHOLARSHIP_STATUS_RULES, ensure_ascii=False
-    )
-    common_json = json.dumps(COMMON_REQUIREMENTS, ensure_ascii=False)
-
-    return render_template_string(
-        INDEX_HTML,
-        status_json=status_json,
-        status_optional_json=status_optional_json,
-        scenario_optional_json=scenario_optional_json,
-        scholarship_json=scholarship_json,
-        scholarship_status_json=scholarship_status_json,
-        common_json=common_json,
-        advancement_notice=ADVANCEMENT_NOTICE,
-        advancement_notice_labels=ADVANCEMENT_NOTICE_LABELS,
-    )
+    accept_encoding = request.headers.get("Accept-Encoding", "").lower()
+    if _INDEX_BR is not None and "br" in accept_encoding:
+        response = Response(_INDEX_BR, mimetype="text/html")
+        response.headers["Content-Encoding"] = "br"
+        response.set_etag(f"{_INDEX_ETAG}-br")
+    elif "gzip" in accept_encoding:
+        response = Response(_INDEX_GZ, mimetype="text/html")
+        response.headers["Content-Encoding"] = "gzip"
+        # エンコーディングごとに表現が異なるので ETag も変える
+        response.set_etag(f"{_INDEX_ETAG}-gz")
+    else:
+        response = Response(_INDEX_BYTES, mimetype="text/html")
+        response.set_etag(_INDEX_ETAG)
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "public, max-age=300"
+    # If-None-Match が一致すれば本文なしの 304 を返す
+    return response.make_conditional(request)
 
 
 INDEX_HTML = """
@@ -89,21 +192,8 @@ INDEX_HTML = """
   <meta charset=\"utf-8\" />
   <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
   <title>在留期間更新 必要書類ナビ</title>
-  <style>
-    :root { color-scheme: light; }
-    body { font-family: system-ui, -apple-system, sans-serif; margin: 2rem; line-height: 1.6; }
-    h1 { font-size: 1.6rem; margin-bottom: 0.2rem; }
-    .card { max-width: 720px; padding: 1.25rem 1.5rem; border: 1px solid #ddd; border-radius: 12px; box-shadow: 0 6px 20px rgba(0,0,0,0.05); }
-    label { display: block; font-weight: 600; margin-top: 1rem; margin-bottom: 0.3rem; }
-    select { width: 100%; padding: 0.5rem; font-size: 1rem; border-radius: 6px; border: 1px solid #ccc; }
-    button { margin-top: 1rem; padding: 0.65rem 1rem; font-size: 1rem; border-radius: 8px; border: 0; background: #0069d9; color: #fff; cursor: pointer; }
-    button:disabled { background: #9ab9e8; cursor: not-allowed; }
-    .scenario-pill { background: #f4f7fb; border: 1px solid #d5e1f3; border-radius: 999px; padding: 0.35rem 0.75rem; cursor: pointer; margin-top: 0; }
-    .scenario-pill.selected { background: #dbe7ff; border-color: #7da3f9; }
-    ul { padding-left: 1.2rem; }
-    .muted { color: #555; }
-    .hidden { display: none; }
-  </style>
+  <link rel=\"stylesheet\" href=\"{{ css_url }}\" />
+  <script src=\"{{ js_url }}\" defer></script>
 </head>
 <body>
   <div class=\"card\">
@@ -113,6 +203,9 @@ INDEX_HTML = """
     <label for=\"status\">現在の身分</label>
     <select id=\"status\">
       <option value=\"\">選択してください</option>
+      {%- for status in statuses %}
+      <option value=\"{{ status }}\">{{ status }}</option>
+      {%- endfor %}
     </select>
 
     <label for=\"scenario\">状況</label>
@@ -123,12 +216,19 @@ INDEX_HTML = """
   <label for=\"scholarship\">奨学金区分（任意）</label>
   <select id=\"scholarship\">
     <option value=\"\">選択なし</option>
+    {%- for scholarship in scholarships %}
+    <option value=\"{{ scholarship }}\">{{ scholarship }}</option>
+    {%- endfor %}
   </select>
 
   <div id=\"scholarship-status-group\" class=\"hidden\" style=\"margin-top: 0.6rem;\">
     <label for=\"scholarship-status\">奨学金の状況（任意）</label>
     <select id=\"scholarship-status\" disabled>
-      <option value=\"\">奨学金区分を先に選んでください</option>
+      <option value=\"\" data-state=\"empty\">奨学金区分を先に選んでください</option>
+      <option value=\"\" data-state=\"ready\" hidden>奨学金の状況を選択してください</option>
+      {%- for scholarship_status in scholarship_statuses %}
+      <option value=\"{{ scholarship_status }}\">{{ scholarship_status }}</option>
+      {%- endfor %}
     </select>
   </div>
 
@@ -137,310 +237,27 @@ INDEX_HTML = """
     <div id=\"results\" style=\"margin-top: 1.4rem;\"></div>
   </div>
 
-  <script>
-    const statusData = {{ status_json | safe }};
-    const scholarshipData = {{ scholarship_json | safe }};
-    const scholarshipStatusData = {{ scholarship_status_json | safe }};
-    const commonRequirements = {{ common_json | safe }};
-    const statusOptionalData = {{ status_optional_json | safe }};
-    const scenarioOptionalData = {{ scenario_optional_json | safe }};
-    const ADVANCEMENT_NOTICE = {{ advancement_notice | tojson }};
-    const ADVANCEMENT_NOTICE_HTML = ADVANCEMENT_NOTICE.replace(
-      /\n/g,
-      '<br />'
-    );
-    const ADVANCEMENT_NOTICE_LABELS = {{ advancement_notice_labels | tojson }};
-    const nonGovScholarships = [
-      "日本政府以外の給付型の奨学金受給学生",
-      "日本政府以外の貸与型の奨学金受給学生",
-    ];
-
-    const statusSelect = document.getElementById('status');
-    const scenarioList = document.getElementById('scenario-list');
-    const scholarshipSelect = document.getElementById('scholarship');
-    const scholarshipStatusGroup = document.getElementById('scholarship-status-group');
-    const scholarshipStatusSelect = document.getElementById('scholarship-status');
-    const showButton = document.getElementById('show');
-    const results = document.getElementById('results');
-    const optionsContainer = document.getElementById('options');
-
-    function populateStatuses() {
-      Object.keys(statusData).forEach((status) => {
-        const option = document.createElement('option');
-        option.value = status;
-        option.textContent = status;
-        statusSelect.appendChild(option);
-      });
-    }
-
-    function populateScholarships() {
-      Object.keys(scholarshipData).forEach((key) => {
-        const option = document.createElement('option');
-        option.value = key;
-        option.textContent = key;
-        scholarshipSelect.appendChild(option);
-      });
-    }
-
-    function populateScholarshipStatuses() {
-      Object.keys(scholarshipStatusData).forEach((key) => {
-        const option = document.createElement('option');
-        option.value = key;
-        option.textContent = key;
-        scholarshipStatusSelect.appendChild(option);
-      });
-    }
-
-    let selectedScenarios = new Set();
-
-    function buildScenarioLabelCandidates(label) {
-      const candidates = [label];
-      if (label.startsWith('この期間内に、')) {
-        candidates.push(label.replace('この期間内に、', '前学期、'));
-      }
-      if (label.startsWith('前学期、')) {
-        candidates.push(label.replace('前学期、', 'この期間内に、'));
-      }
-      return candidates;
-    }
-
-    function renderOptions() {
-      optionsContainer.innerHTML = '';
-      const status = statusSelect.value;
-      if (!status) return;
-
-      const optionItems = [];
-      if (statusOptionalData[status]) {
-        optionItems.push(...statusOptionalData[status]);
-      }
-
-      const scenarioOptions = scenarioOptionalData[status] || {};
-      selectedScenarios.forEach((scenarioLabel) => {
-        const labelCandidates = buildScenarioLabelCandidates(scenarioLabel);
-        labelCandidates.forEach((candidate) => {
-          if (scenarioOptions[candidate]) {
-            optionItems.push(...scenarioOptions[candidate]);
-          }
-        });
-      });
-
-      const uniqueItems = new Map();
-      optionItems.forEach((item) => {
-        if (!uniqueItems.has(item.label)) {
-          uniqueItems.set(item.label, item);
-        }
-      });
-
-      const dedupedItems = Array.from(uniqueItems.values());
-
-      if (!dedupedItems.length) return;
-
-      const wrapper = document.createElement('div');
-      const description = document.createElement('div');
-      description.textContent = '該当する場合はチェックを入れてください';
-      description.style.fontWeight = '600';
-      description.style.marginBottom = '0.35rem';
-      wrapper.appendChild(description);
-
-      dedupedItems.forEach((item, idx) => {
-        const label = document.createElement('label');
-        label.style.fontWeight = '500';
-        label.style.display = 'flex';
-        label.style.alignItems = 'center';
-        label.style.gap = '0.4rem';
-        label.style.marginBottom = '0.25rem';
-
-        const checkbox = document.createElement('input');
-        checkbox.type = 'checkbox';
-        checkbox.id = `option-${idx}`;
-        checkbox.dataset.requirements = JSON.stringify(item.requirements || []);
-        checkbox.dataset.label = item.label;
-        checkbox.addEventListener('change', showRequirements);
-
-        const text = document.createElement('span');
-        text.textContent = item.label;
-
-        label.appendChild(checkbox);
-        label.appendChild(text);
-        wrapper.appendChild(label);
-      });
-
-      optionsContainer.appendChild(wrapper);
-    }
-
-    function resetScenarioSelection() {
-      selectedScenarios = new Set();
-    }
-
-    function updateShowButtonState() {
-      showButton.disabled = !statusSelect.value || selectedScenarios.size === 0;
-    }
-
-    function toggleScenarioSelection(label, button, event) {
-      if (event && event.detail > 1) {
-        return;
-      }
-
-      if (selectedScenarios.has(label)) {
-        selectedScenarios.delete(label);
-        button.classList.remove('selected');
-        button.setAttribute('aria-pressed', 'false');
-      } else {
-        selectedScenarios.add(label);
-        button.classList.add('selected');
-        button.setAttribute('aria-pressed', 'true');
-      }
-
-      updateShowButtonState();
-      renderOptions();
-      showRequirements();
-    }
-
-    function renderScenarios() {
-      const status = statusSelect.value;
-      scenarioList.innerHTML = '';
-      resetScenarioSelection();
-      updateShowButtonState();
-      renderOptions();
-
-      if (!status) {
-        const placeholder = document.createElement('span');
-        placeholder.textContent = '現在の身分を先に選んでください';
-        placeholder.classList.add('muted');
-        scenarioList.appendChild(placeholder);
-        return;
-      }
-
-      statusData[status].forEach((scenario) => {
-        const button = document.createElement('button');
-        button.type = 'button';
-        button.textContent = scenario.label;
-        button.className = 'scenario-pill';
-        button.setAttribute('aria-pressed', 'false');
-        button.addEventListener('click', (event) =>
-          toggleScenarioSelection(scenario.label, button, event)
-        );
-        scenarioList.appendChild(button);
-      });
-    }
-
-    function renderRequirements(requirements, noticeText) {
-      results.innerHTML = '';
-
-      if (noticeText) {
-        const notice = document.createElement('p');
-        notice.innerHTML = `<strong style="color: #c00;">${noticeText}</strong>`;
-        notice.style.marginBottom = '0.5rem';
-        results.appendChild(notice);
-      }
-
-      if (!requirements.length) {
-        const empty = document.createElement('p');
-        empty.textContent = '必要な書類はありません。';
-        results.appendChild(empty);
-        return;
-      }
-
-      const list = document.createElement('ul');
-      requirements.forEach((item) => {
-        const li = document.createElement('li');
-        li.textContent = item;
-        list.appendChild(li);
-      });
-      results.appendChild(list);
-    }
-
-    function getSelectedOptionalSelections() {
-      const checkboxes = optionsContainer.querySelectorAll(
-        'input[type="checkbox"]:checked'
-      );
-      return Array.from(checkboxes).map((checkbox) => {
-        const selection = { label: checkbox.dataset.label || '', requirements: [] };
-        try {
-          selection.requirements = JSON.parse(checkbox.dataset.requirements || '[]');
-        } catch (err) {
-          selection.requirements = [];
-        }
-        return selection;
-      });
-    }
-
-    function showRequirements() {
-      const status = statusSelect.value;
-      const scholarship = scholarshipSelect.value;
-      const scholarshipStatus = nonGovScholarships.includes(scholarship)
-        ? scholarshipStatusSelect.value
-        : '';
-      if (!status || selectedScenarios.size === 0) {
-        renderRequirements([]);
-        return;
-      }
-
-      const scenarios = statusData[status] || [];
-      const scenarioRequirements = Array.from(selectedScenarios).flatMap(
-        (label) => {
-          const scenario = scenarios.find((item) => item.label === label);
-          return scenario ? scenario.requirements : [];
-        }
-      );
-      const optionalSelections = getSelectedOptionalSelections();
-      const optionalRequirements = optionalSelections.flatMap(
-        (selection) => selection.requirements
-      );
-      const shouldShowAdvancementNotice = optionalSelections.some(
-        (selection) => ADVANCEMENT_NOTICE_LABELS.includes(selection.label)
-      );
-      const noticeText = shouldShowAdvancementNotice ? ADVANCEMENT_NOTICE_HTML : '';
-      const requirements = [
-        ...commonRequirements,
-        ...scenarioRequirements,
-        ...optionalRequirements,
-        ...(scholarship ? (scholarshipData[scholarship] || []) : []),
-        ...(scholarshipStatus
-          ? scholarshipStatusData[scholarshipStatus] || []
-          : []),
-      ];
-      renderRequirements(requirements, noticeText);
-    }
-
-    statusSelect.addEventListener('change', () => {
-      renderScenarios();
-      showRequirements();
-    });
-
-    scholarshipSelect.addEventListener('change', showRequirements);
-    scholarshipSelect.addEventListener('change', () => {
-      const isNonGov = nonGovScholarships.includes(scholarshipSelect.value);
-      if (!scholarshipSelect.value) {
-        scholarshipStatusGroup.classList.add('hidden');
-        scholarshipStatusSelect.value = '';
-        scholarshipStatusSelect.disabled = true;
-        scholarshipStatusSelect.options[0].textContent = '奨学金区分を先に選んでください';
-      } else if (isNonGov) {
-        scholarshipStatusGroup.classList.remove('hidden');
-        scholarshipStatusSelect.disabled = false;
-        scholarshipStatusSelect.options[0].textContent = '奨学金の状況を選択してください';
-      } else {
-        scholarshipStatusGroup.classList.add('hidden');
-        scholarshipStatusSelect.value = '';
-        scholarshipStatusSelect.disabled = true;
-        scholarshipStatusSelect.options[0].textContent = '奨学金区分を先に選んでください';
-      }
-    });
-    scholarshipStatusSelect.addEventListener('change', showRequirements);
-    showButton.addEventListener('click', showRequirements);
-
-    populateStatuses();
-    populateScholarships();
-    populateScholarshipStatuses();
-    renderScenarios();
-  </script>
+  <script id=\"rules-data\" type=\"application/json\">{{ rules_json | safe }}</script>
 </body>
 </html>
 """
 
+# ルールは起動後に変化しないため、テンプレートを一度だけコンパイル・
+# レンダリングして使い回す。日本語テキスト中心のページなので gzip 版も
+# 合わせて用意しておく。
+_INDEX_TEMPLATE: Final = app.jinja_env.from_string(INDEX_HTML)
+_INDEX_HTML_CACHED: Final[str] = _render_index_html()
+_INDEX_BYTES: Final[bytes] = _INDEX_HTML_CACHED.encode("utf-8")
+_INDEX_GZ: Final[bytes] = gzip.compress(_INDEX_BYTES, compresslevel=9)
+# brotli はインストールされている場合のみ（gzip より 1-2 割小さくなる）
+_INDEX_BR: Final = brotli.compress(_INDEX_BYTES, quality=11) if brotli else None
+_INDEX_ETAG: Final[str] = hashlib.blake2b(_INDEX_BYTES).hexdigest()[:16]
+
 
 def main() -> None:
+    # argparse はコマンド起動時にしか使わないので、ここで読み込む
+    import argparse
+
     parser = argparse.ArgumentParser(description="在留期間更新の必要書類をWebで案内します。")
     parser.add_argument("--host", default="0.0.0.0", help="サーバーのバインド先ホスト")
     parser.add_argument("--port", type=int, default=5000, help="サーバーのポート番号")